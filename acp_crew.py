@@ -1,15 +1,18 @@
 import asyncio
-import nest_asyncio
-from acp_sdk.client import Client
+import logging
 from acp_marketing.fastacp import AgentCollection, ACPCallingAgent
-from colorama import Fore
 from typing import Optional
+from output_writer import output_writer
+from marketing_config import PLANNER_CLIENT, WRITER_CLIENT, MarketingWorkflowConfig, close_clients, join_benefits
+from string import Template
 from crewai import LLM
 
 from dotenv import load_dotenv
 import os
 
-nest_asyncio.apply()
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 
 load_dotenv()
 model = LLM(
@@ -18,25 +21,6 @@ model = LLM(
     max_tokens=2048
 )
 
-class MarketingWorkflowConfig:
-    """Configuration for the marketing workflow"""
-    PLANNER_SERVER_URL = "http://localhost:8000"
-    WRITER_SERVER_URL = "http://localhost:8001"
-    
-    # Default marketing context
-    DEFAULT_CONTEXT = {
-        "company_type": "AI startup",
-        "industry": "Marketing Technology",
-        "target_audience": "Marketing professionals, business owners, and growth teams",
-        "value_proposition": "AI-powered marketing optimization and content creation",
-        "key_benefits": [
-            "Automated content generation",
-            "SEO optimization",
-            "Audience targeting",
-            "Performance analytics"
-        ]
-    }
-
 async def run_marketing_workflow(
     company_context: Optional[dict] = None,
     specific_request: Optional[str] = None
@@ -54,53 +38,50 @@ async def run_marketing_workflow(
     config = MarketingWorkflowConfig()
     # start with default-context dictionary, overriding with company_context if provided
     context = {**config.DEFAULT_CONTEXT, **(company_context or {})}
-    async with Client(base_url="http://localhost:8000") as planner, Client(base_url="http://localhost:8001") as writer:
-        # agents discovery
-        agent_collection=await AgentCollection.from_acp(planner, writer)
-        print(f"Discovered agents: {[agent.name for client, agent in agent_collection.agents]}")
-
-        # dictionary structure for ACPCallingAgent
-        acp_agents={agent.name: {'agent': agent, 'client': client} for client, agent in agent_collection.agents}
-        # passing the agents as tools to ACPCallingAgent with CrewAI LLM
-        acpagent=ACPCallingAgent(
-            acp_agents=acp_agents,
-            model=model
-        )
-        
-        # Create structured input for the planner
-        formatted_input = format_input_for_acp_orchestrator(context, specific_request)
-
-        # running the agent with a user query
-        result = await acpagent.run(formatted_input)
-        print(Fore.YELLOW + f"Final result:\n{result}" + Fore.RESET)
-
-        # Save blog content
-        output_dir = "marketing_outputs"
-        os.makedirs(output_dir, exist_ok=True)
-
-        blog_filename = f"{output_dir}/blog_post.md"
-        with open(blog_filename, 'w', encoding='utf-8') as f:
-            f.write(f"**Company:** {context['company_type']}\n")
-            f.write(f"**Industry:** {context['industry']}\n\n")
-            f.write(result)
+    # agents discovery
+    agent_collection=await AgentCollection.from_acp(PLANNER_CLIENT, WRITER_CLIENT)
+    logger.info(f"Discovered agents: {[agent.name for client, agent in agent_collection.agents]}")
+
+    # dictionary structure for ACPCallingAgent
+    acp_agents={agent.name: {'agent': agent, 'client': client} for client, agent in agent_collection.agents}
+    # passing the agents as tools to ACPCallingAgent with CrewAI LLM
+    acpagent=ACPCallingAgent(
+        acp_agents=acp_agents,
+        model=model
+    )
+    
+    # Create structured input for the planner
+    formatted_input = format_input_for_acp_orchestrator(context, specific_request)
 
+    # running the agent with a user query
+    result = await acpagent.run(formatted_input)
+    logger.info(f"Final result:\n{result}")
+
+    # Save blog content
+    output_dir = "marketing_outputs"
+    os.makedirs(output_dir, exist_ok=True)
+
+    blog_filename = f"{output_dir}/blog_post.md"
+    await output_writer.submit(blog_filename, (
+        f"**Company:** {context['company_type']}\n"
+        f"**Industry:** {context['industry']}\n\n"
+        f"{result}"
+    ).encode('utf-8'))
 
 
-def format_input_for_acp_orchestrator(context: dict, specific_request: Optional[str] = None) -> str:
-    """
-    Create a user prompt for the ACPCallingAgent, focusing on the business/content request and context.
-    """
-    base_prompt = f"""
-Create a marketing blog post for {context['company_type']} in the {context['industry']} industry.
+
+# Orchestrator prompt template is built once at import; only the values are substituted per call
+_ORCHESTRATOR_TEMPLATE = Template("""
+Create a marketing blog post for $company_type in the $industry industry.
 
 COMPANY CONTEXT:
-- Company Type: {context['company_type']}
-- Industry: {context['industry']}
-- Target Audience: {context['target_audience']}
-- Value Proposition: {context['value_proposition']}
-- Key Benefits: {', '.join(context['key_benefits'])}
+- Company Type: $company_type
+- Industry: $industry
+- Target Audience: $target_audience
+- Value Proposition: $value_proposition
+- Key Benefits: $key_benefits
 
-SPECIFIC REQUEST: {specific_request or 'Create a comprehensive marketing strategy to increase brand awareness and drive customer acquisition.'}
+SPECIFIC REQUEST: $specific_request
 
 REQUIREMENTS:
 - Research current marketing trends in the AI/tech industry.
@@ -123,8 +104,17 @@ OUTPUT FORMAT:
 - Budget Allocation
 - Success Metrics & KPIs
 - Risk Assessment
-"""
-    return base_prompt.strip()
+""".strip())
+
+def format_input_for_acp_orchestrator(context: dict, specific_request: Optional[str] = None) -> str:
+    """
+    Create a user prompt for the ACPCallingAgent, focusing on the business/content request and context.
+    """
+    return _ORCHESTRATOR_TEMPLATE.substitute(
+        context,
+        key_benefits=join_benefits(tuple(context['key_benefits'])),
+        specific_request=specific_request or MarketingWorkflowConfig.DEFAULT_REQUEST
+    )
 
 
 if __name__ == "__main__":
@@ -142,9 +132,15 @@ if __name__ == "__main__":
         ]
     }
     
-    print("Starting ACP Marketing Workflow...")
+    logger.info("Starting ACP Marketing Workflow...")
     
-    asyncio.run(run_marketing_workflow(
-        company_context=company_context,
-        specific_request="Create a marketing strategy to launch our new AI-powered marketing automation platform"
-    )) 
\ No newline at end of file
+    async def main():
+        try:
+            await run_marketing_workflow(
+                company_context=company_context,
+                specific_request="Create a marketing strategy to launch our new AI-powered marketing automation platform"
+            )
+        finally:
+            await close_clients()
+
+    asyncio.run(main()) 
\ No newline at end of file
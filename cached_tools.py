@@ -0,0 +1,77 @@
+import asyncio
+import json
+from functools import lru_cache
+from typing import Any, Callable, Type
+
+from crewai.tools import BaseTool
+from crewai_tools import SerperDevTool, WebsiteSearchTool
+from pydantic import BaseModel, Field
+
+
+@lru_cache(maxsize=1024)
+def _cached_run(tool: Any, run: Callable, arguments: str) -> Any:
+    """Call the uncached tool implementation once per distinct set of arguments."""
+    args, kwargs = json.loads(arguments)
+    return run(tool, *args, **kwargs)
+
+
+def _cache_key(args: tuple, kwargs: dict) -> str:
+    """Serialize tool arguments into a stable, hashable cache key."""
+    return json.dumps([args, kwargs], sort_keys=True, default=str)
+
+
+class CachedSerperDevTool(SerperDevTool):
+    """SerperDevTool that reuses results for repeated queries, within and across requests."""
+
+    def __hash__(self) -> int:
+        return id(self)
+
+    def _run(self, *args: Any, **kwargs: Any) -> Any:
+        return _cached_run(self, SerperDevTool._run, _cache_key(args, kwargs))
+
+
+class CachedWebsiteSearchTool(WebsiteSearchTool):
+    """WebsiteSearchTool that reuses results for repeated (query, website) pairs."""
+
+    def __hash__(self) -> int:
+        return id(self)
+
+    def _run(self, *args: Any, **kwargs: Any) -> Any:
+        return _cached_run(self, WebsiteSearchTool._run, _cache_key(args, kwargs))
+
+
+class BatchSearchSchema(BaseModel):
+    """Input for BatchSerperDevTool."""
+    search_queries: list[str] = Field(..., description="Independent search queries to run at the same time")
+
+
+class BatchSerperDevTool(BaseTool):
+    """Fans several queries out to a CachedSerperDevTool concurrently in a single tool call."""
+
+    name: str = "Search the internet with multiple queries"
+    description: str = (
+        "Run several independent internet searches at once, e.g. market size, competitors and trends. "
+        "Prefer this over repeated single searches when you already know all the queries you need."
+    )
+    args_schema: Type[BaseModel] = BatchSearchSchema
+    search_tool: CachedSerperDevTool
+
+    def _run(self, search_queries: list[str], **kwargs: Any) -> dict:
+        # CrewAI calls tools from kickoff_async's worker thread, which has no running event loop
+        return asyncio.run(self._search_all(list(dict.fromkeys(search_queries))))
+
+    async def _search_all(self, queries: list[str]) -> dict:
+        """
+        Run each query through the shared single-search tool, so results share its cache.
+
+        Returns:
+            dict: SerperDevTool's result for each query, or an error entry if that query failed
+        """
+        results = await asyncio.gather(
+            *[asyncio.to_thread(self.search_tool._run, search_query=query) for query in queries],
+            return_exceptions=True
+        )
+        return {
+            query: {"error": str(result)} if isinstance(result, Exception) else result
+            for query, result in zip(queries, results)
+        }
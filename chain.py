@@ -1,33 +1,42 @@
 from acp_sdk.client import Client
+from acp_sdk.models import ErrorEvent, MessageCompletedEvent, RunFailedEvent
 import asyncio 
-from colorama import Fore, Style
+from string import Template
 import logging
 from typing import Optional
-import json
+from output_writer import output_writer
+from marketing_config import PLANNER_CLIENT, WRITER_CLIENT, MarketingWorkflowConfig, close_clients, join_benefits
 import os
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class MarketingWorkflowConfig:
-    """Configuration for the marketing workflow"""
-    PLANNER_SERVER_URL = "http://localhost:8000"
-    WRITER_SERVER_URL = "http://localhost:8001"
+async def stream_agent_output(client: Client, agent: str, input: str) -> str:
+    """
+    Stream an agent run and collect its messages as they complete.
     
-    # Default marketing context
-    DEFAULT_CONTEXT = {
-        "company_type": "AI startup",
-        "industry": "Marketing Technology",
-        "target_audience": "Marketing professionals, business owners, and growth teams",
-        "value_proposition": "AI-powered marketing optimization and content creation",
-        "key_benefits": [
-            "Automated content generation",
-            "SEO optimization",
-            "Audience targeting",
-            "Performance analytics"
-        ]
-    }
+    Args:
+        client: ACP client for the server hosting the agent
+        agent: Name of the agent to run
+        input: Prompt to send to the agent
+    
+    Returns:
+        str: All completed messages joined into one document
+    """
+    messages = []
+    async for event in client.run_stream(agent=agent, input=input):
+        if isinstance(event, MessageCompletedEvent):
+            messages.append("".join(part.content for part in event.message.parts))
+            logger.info(f"Received message {len(messages)} from {agent}")
+        elif isinstance(event, RunFailedEvent):
+            raise ValueError(f"{agent} run failed: {event.run.error}")
+        elif isinstance(event, ErrorEvent):
+            raise ValueError(f"{agent} run failed: {event.error}")
+    
+    if not messages:
+        raise ValueError(f"No output received from {agent}")
+    return "\n\n".join(messages)
 
 async def run_marketing_workflow(
     company_context: Optional[dict] = None,
@@ -48,90 +57,68 @@ async def run_marketing_workflow(
     
     # Create structured input for the planner
     planner_input = create_planner_input(context, specific_request)
+    
+    logger.info("===== Starting marketing planning phase =====")
+    
+    # Step 1: Stream the marketing plan
+    marketing_plan = await stream_agent_output(PLANNER_CLIENT, "marketing_planner", planner_input)
+    logger.info(f"📋 MARKETING PLAN:\n{marketing_plan}")
 
-    async with Client(base_url=config.PLANNER_SERVER_URL) as planner, \
-                Client(base_url=config.WRITER_SERVER_URL) as writer:
-        
-        logger.info("===== Starting marketing planning phase =====")
-        
-        # Step 1: Generate marketing plan
-        run1 = await planner.run_sync(
-            agent="marketing_planner", 
-            input=planner_input
-        )
-        
-        if not run1.output or not run1.output[0].parts:
-            raise ValueError("No output received from marketing planner")
-            
-        marketing_plan = run1.output[0].parts[0].content
-        print(f"{Fore.LIGHTMAGENTA_EX}📋 MARKETING PLAN:{Style.RESET_ALL}")
-        print(f"{Fore.LIGHTMAGENTA_EX}{marketing_plan}{Style.RESET_ALL}")
-        print(f"{Fore.CYAN}{'='*80}{Style.RESET_ALL}")
-
-        # Step 2: Generate blog content
-        logger.info("======= Starting content creation phase ======")
-        writer_input = create_writer_input(marketing_plan, context)
-        
-        run2 = await writer.run_sync(
-            agent="supervisor_agent", 
-            input=writer_input
-        )
-        
-        if not run2.output or not run2.output[0].parts:
-            raise ValueError("No output received from blog writer")
-            
-        blog_content = run2.output[0].parts[0].content
-        print(f"{Fore.YELLOW}📝 BLOG CONTENT:{Style.RESET_ALL}")
-        print(f"{Fore.YELLOW}{blog_content}{Style.RESET_ALL}")
-        
-        # Save outputs to files
-        
-        # Create output directory if it doesn't exist
-        output_dir = "marketing_outputs"
-        os.makedirs(output_dir, exist_ok=True)
-        
-        # Save marketing plan
-        plan_filename = f"{output_dir}/marketing_plan.md"
-        with open(plan_filename, 'w', encoding='utf-8') as f:
-            f.write(f"# Marketing Plan\n\n")
-            f.write(f"**Company:** {context['company_type']}\n")
-            f.write(f"**Industry:** {context['industry']}\n\n")
-            f.write(marketing_plan)
-        
-        # Save blog content
-        blog_filename = f"{output_dir}/blog_post.md"
-        with open(blog_filename, 'w', encoding='utf-8') as f:
-            f.write(f"# Blog Post\n\n")
-            f.write(f"**Company:** {context['company_type']}\n")
-            f.write(f"**Industry:** {context['industry']}\n\n")
-            f.write(blog_content)
-        
-        
-        return {
-            "marketing_plan": marketing_plan,
-            "blog_content": blog_content,
-            "context": context,
-            "status": "success",
-            "files": {
-                "marketing_plan": plan_filename,
-                "blog_post": blog_filename
-            }
+    # Step 2: Generate blog content
+    logger.info("======= Starting content creation phase ======")
+    writer_input = create_writer_input(marketing_plan, context)
+    
+    # Writing and cleanup happen in a single blog_writer call
+    blog_content = await stream_agent_output(WRITER_CLIENT, "blog_writer", writer_input)
+    logger.info(f"📝 BLOG CONTENT:\n{blog_content}")
+    
+    # Save outputs to files
+    
+    # Create output directory if it doesn't exist
+    output_dir = "marketing_outputs"
+    os.makedirs(output_dir, exist_ok=True)
+    
+    # Save marketing plan and blog content together on the shared writer thread
+    plan_filename = f"{output_dir}/marketing_plan.md"
+    blog_filename = f"{output_dir}/blog_post.md"
+    await asyncio.gather(
+        output_writer.submit(plan_filename, (
+            f"# Marketing Plan\n\n"
+            f"**Company:** {context['company_type']}\n"
+            f"**Industry:** {context['industry']}\n\n"
+            f"{marketing_plan}"
+        ).encode('utf-8')),
+        output_writer.submit(blog_filename, (
+            f"# Blog Post\n\n"
+            f"**Company:** {context['company_type']}\n"
+            f"**Industry:** {context['industry']}\n\n"
+            f"{blog_content}"
+        ).encode('utf-8'))
+    )
+    
+    return {
+        "marketing_plan": marketing_plan,
+        "blog_content": blog_content,
+        "context": context,
+        "status": "success",
+        "files": {
+            "marketing_plan": plan_filename,
+            "blog_post": blog_filename
         }
-        
+    }
 
-def create_planner_input(context: dict, specific_request: Optional[str] = None) -> str:
-    """Create a structured input for the marketing planner"""
-    base_prompt = f"""
-Create a comprehensive marketing strategy for {context['company_type']} in the {context['industry']} industry.
+# Prompt templates are built once at import; only the values are substituted per call
+_PLANNER_TEMPLATE = Template("""
+Create a comprehensive marketing strategy for $company_type in the $industry industry.
 
 COMPANY CONTEXT:
-- Company Type: {context['company_type']}
-- Industry: {context['industry']}
-- Target Audience: {context['target_audience']}
-- Value Proposition: {context['value_proposition']}
-- Key Benefits: {', '.join(context['key_benefits'])}
+- Company Type: $company_type
+- Industry: $industry
+- Target Audience: $target_audience
+- Value Proposition: $value_proposition
+- Key Benefits: $key_benefits
 
-SPECIFIC REQUEST: {specific_request or 'Create a comprehensive marketing strategy to increase brand awareness and drive customer acquisition'}
+SPECIFIC REQUEST: $specific_request
 
 REQUIREMENTS:
 1. Research current marketing trends in the AI/tech industry
@@ -148,30 +135,29 @@ REQUIREMENTS:
 7. Timeline for implementation
 
 OUTPUT FORMAT:
-- Executive Summary
+## Research
 - Market Analysis
 - Target Audience Analysis
+## Strategy
+- Executive Summary
 - Marketing Strategy Overview
 - Channel-Specific Tactics
 - Implementation Timeline
 - Budget Allocation
 - Success Metrics & KPIs
 - Risk Assessment
-"""
-    return base_prompt.strip()
+""".strip())
 
-def create_writer_input(marketing_plan: str, context: dict) -> str:
-    """Create a structured input for the blog writer"""
-    return f"""
+_WRITER_TEMPLATE = Template("""
 Write a compelling, SEO-optimized blog post based on the following marketing strategy.
 
 MARKETING STRATEGY:
-{marketing_plan}
+$marketing_plan
 
 COMPANY CONTEXT:
-- Company: {context['company_type']}
-- Industry: {context['industry']}
-- Target Audience: {context['target_audience']}
+- Company: $company_type
+- Industry: $industry
+- Target Audience: $target_audience
 
 BLOG POST REQUIREMENTS:
 1. Create an engaging headline that includes relevant keywords
@@ -187,7 +173,19 @@ BLOG POST REQUIREMENTS:
 IMPORTANT: Write the blog post in clean markdown format, ready-to-publish. Do NOT include labels like "SEO-Optimized Headline:" or "Meta Description:". 
 Just write the actual blog post content with proper markdown formatting (headings, paragraphs, lists, etc.).
 Start directly with the main headline and content.
-"""
+""")
+
+def create_planner_input(context: dict, specific_request: Optional[str] = None) -> str:
+    """Create a structured input for the marketing planner"""
+    return _PLANNER_TEMPLATE.substitute(
+        context,
+        key_benefits=join_benefits(tuple(context['key_benefits'])),
+        specific_request=specific_request or MarketingWorkflowConfig.DEFAULT_REQUEST
+    )
+
+def create_writer_input(marketing_plan: str, context: dict) -> str:
+    """Create a structured input for the blog writer"""
+    return _WRITER_TEMPLATE.substitute(context, marketing_plan=marketing_plan)
 
 if __name__ == "__main__":
     # Example usage with custom context
@@ -204,7 +202,13 @@ if __name__ == "__main__":
         ]
     }
     
-    asyncio.run(run_marketing_workflow(
-        company_context=comany_context,
-        specific_request="Create a marketing strategy to launch our new AI-powered marketing automation platform"
-    ))
\ No newline at end of file
+    async def main():
+        try:
+            await run_marketing_workflow(
+                company_context=comany_context,
+                specific_request="Create a marketing strategy to launch our new AI-powered marketing automation platform"
+            )
+        finally:
+            await close_clients()
+
+    asyncio.run(main())
\ No newline at end of file
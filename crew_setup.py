@@ -0,0 +1,19 @@
+import os
+
+from crewai import Agent
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# CrewAI's per-step console logging is costly, so it is opt-in via CREW_VERBOSE=true
+CREW_VERBOSE = os.getenv("CREW_VERBOSE", "false").lower() in ("1", "true", "yes")
+
+
+def request_agent(agent: Agent) -> Agent:
+    """
+    Copy a module-level agent for a single request.
+    Agents and their tools are built once per server process. The copy shares those tools,
+    including their memoized search results, but not CrewAI's executor state, so concurrent
+    requests never step on each other.
+    """
+    return agent.copy()
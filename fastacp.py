@@ -1,14 +1,18 @@
 from typing import List, Dict, Callable, Optional, Union, Any
+import asyncio
 import json
+import logging
+from collections import Counter
 from dataclasses import dataclass
 from enum import Enum
-from colorama import Fore
 from acp_sdk.client import Client
 from acp_sdk.models import (
     Message,
     MessagePart,
 )
 
+logger = logging.getLogger(__name__)
+
 # === AgentCollection Implementation ===
 
 class Agent:
@@ -155,7 +159,7 @@ class Tool:
         self.client = client
     
     async def __call__(self, *args, **kwargs):
-        print(Fore.YELLOW + 'Tool being called with args: ' + str(args) + ' and kwargs: ' + str(kwargs) + Fore.RESET)
+        logger.debug("Tool being called with args: %s and kwargs: %s", args, kwargs)
     
         # Extract the input content from either args or kwargs
         content = ""
@@ -170,12 +174,12 @@ class Tool:
             content = next(iter(kwargs.values()))
             
         # Now use the extracted content in your message
-        print(Fore.MAGENTA + content + Fore.RESET) 
+        logger.debug("%s input: %s", self.name, content)
         response = await self.client.run_sync(
             agent=self.name, 
             input=[Message(parts=[MessagePart(content=content, content_type="text/plain")])]
         )
-        print(Fore.RED + str(response) + Fore.RESET) 
+        logger.debug("%s response: %s", self.name, response)
         return response.output[0].parts[0].content
 
 
@@ -265,6 +269,8 @@ def _convert_messages_to_prompt(messages: List[Dict[str, Any]], tools: List[Tool
         prompt_parts.append("\nTo use a tool, respond in this exact format:")
         prompt_parts.append("TOOL_CALL: tool_name")
         prompt_parts.append("ARGUMENTS: {\"key\": \"value\"}")
+        prompt_parts.append("\nIf several tool calls do not depend on each other's results, list each TOOL_CALL/ARGUMENTS pair")
+        prompt_parts.append("in the same response and they will run concurrently.")
         prompt_parts.append("\nOr if you have a final answer, use:")
         prompt_parts.append("TOOL_CALL: final_answer")
         prompt_parts.append("ARGUMENTS: {\"answer\": \"your final answer\"}")
@@ -277,15 +283,18 @@ def _parse_crewai_response(response_text: str) -> ChatMessage:
     content = response_text
     tool_calls = None
     
-    # Parse tool calls from the response
+    # Parse tool calls from the response; several TOOL_CALL/ARGUMENTS pairs may appear in one reply
     if "TOOL_CALL:" in content:
         lines = content.split('\n')
+        tool_calls = []
         tool_name = None
-        arguments = {}
         
         for line in lines:
             line = line.strip()
             if line.startswith("TOOL_CALL:"):
+                if tool_name:
+                    # Previous tool call had no arguments line
+                    tool_calls.append(ToolCall(name=tool_name, arguments={}, id=f"crewai_call_{len(tool_calls) + 1}"))
                 tool_name = line.split("TOOL_CALL:", 1)[1].strip()
             elif line.startswith("ARGUMENTS:") and tool_name:
                 try:
@@ -294,14 +303,12 @@ def _parse_crewai_response(response_text: str) -> ChatMessage:
                 except json.JSONDecodeError:
                     # If JSON parsing fails, use the text as input
                     arguments = {"input": args_text}
-                break
+                tool_calls.append(ToolCall(name=tool_name, arguments=arguments, id=f"crewai_call_{len(tool_calls) + 1}"))
+                tool_name = None
         
         if tool_name:
-            tool_calls = [ToolCall(
-                name=tool_name,
-                arguments=arguments,
-                id="crewai_call_1"
-            )]
+            tool_calls.append(ToolCall(name=tool_name, arguments={}, id=f"crewai_call_{len(tool_calls) + 1}"))
+        tool_calls = tool_calls or None
     
     return ChatMessage(
         content=content,
@@ -342,6 +349,7 @@ class ACPCallingAgent(MultiStepAgent):
                 - Always use the final_answer tool when you have a complete answer
                 - Do not provide answers in your regular messages
                 - Chain multiple agent calls if needed to gather all required information
+                - Agent calls that do not depend on each other can be made in the same step and run concurrently
                 - The final_answer tool is the only way to return results to the user
                 """
             }
@@ -359,7 +367,7 @@ class ACPCallingAgent(MultiStepAgent):
             # Override the __call__ method in Tool to make it actually call the ACP agent
             def make_caller(agent_name, client):
                 async def call_agent(prompt, **kwargs):
-                    print(f"Calling {agent_name} with prompt: {prompt}")
+                    logger.debug("Calling %s with prompt: %s", agent_name, prompt)
                     response=await client.run_sync(
                         agent=agent_name,
                         inputs=[Message(parts=[MessagePart(content=prompt,content_type="text/plain")])]
@@ -442,8 +450,7 @@ class ACPCallingAgent(MultiStepAgent):
             memory_step.model_input_messages=memory_messages.copy()
 
             try:
-                import logging, sys
-                logging.warn(list(self.tools.values())[:-1])
+                logger.debug("Tools offered to the model: %s", list(self.tools.values())[:-1])
                 model_message: ChatMessage = self.model(
                     memory_messages,
                     tools_to_call_from=list(self.tools.values())[:-1],
@@ -508,8 +515,35 @@ class ACPCallingAgent(MultiStepAgent):
                     "Model did not call any agents and no final answer detected. Content: " + (model_message.content or "None"), 
                     self.logger
                 )
-        # Process the tool call
-        tool_call = model_message.tool_calls[0]
+        # Process the tool calls
+        calls = [self._unpack_tool_call(tool_call) for tool_call in model_message.tool_calls]
+        # Agent calls run before the final answer so it can refer to their saved responses;
+        # only the first final answer is used
+        agent_calls = [call for call in calls if call[0] != "final_answer"]
+        final_calls = [call for call in calls if call[0] == "final_answer"][:1]
+
+        # Record only the calls that actually run
+        memory_step.model_output = "; ".join(
+            f"Called agent: '{agent_name}' with arguments: {agent_arguments}"
+            for agent_name, agent_arguments, _ in agent_calls + final_calls
+        )
+        memory_step.tool_calls = [ToolCall(name=agent_name, arguments=agent_arguments, id=tool_call_id)
+                                  for agent_name, agent_arguments, tool_call_id in agent_calls + final_calls]
+
+        # Independent agent calls run concurrently
+        if len(agent_calls) > 1:
+            await self._process_tool_calls(memory_step, agent_calls)
+        elif agent_calls:
+            agent_name, agent_arguments, _ = agent_calls[0]
+            await self._process_tool_call(memory_step, agent_name, agent_arguments)
+
+        if final_calls:
+            _, agent_arguments, _ = final_calls[0]
+            return await self._process_tool_call(memory_step, "final_answer", agent_arguments)
+        return None
+    
+    def _unpack_tool_call(self, tool_call: Any) -> tuple:
+        """Extract (name, arguments, id) from a tool call in any of the supported formats"""
         # Handle different tool call formats
         if hasattr(tool_call, 'function') and hasattr(tool_call.function, 'name'):
             # Standard OpenAI-like format
@@ -526,12 +560,36 @@ class ACPCallingAgent(MultiStepAgent):
             agent_name = tool_call.get('name', tool_call.get('function', {}).get('name', 'unknown'))
             agent_arguments = tool_call.get('arguments', tool_call.get('function', {}).get('arguments', {}))
             tool_call_id = tool_call.get('id', 'unknown_id')
-        
-        memory_step.model_output=str(f"Called agent: '{agent_name}' with arguments: {agent_arguments}")
-        memory_step.tool_calls=[ToolCall(name=agent_name, arguments=agent_arguments, id=tool_call_id)]
-
-        return await self._process_tool_call(memory_step, agent_name, agent_arguments)
+        return agent_name, agent_arguments, tool_call_id
     
+    async def _process_tool_calls(self, memory_step: ActionStep, calls: List[tuple]) -> None:
+        """Execute several independent ACP agent calls concurrently and combine their observations"""
+        self.logger.log(
+            f"Calling agents concurrently: {[agent_name for agent_name, _, _ in calls]}",
+            level=LogLevel.INFO,
+        )
+        observations = await asyncio.gather(*[
+            self.execute_tool_call(agent_name, agent_arguments if agent_arguments is not None else {})
+            for agent_name, agent_arguments, _ in calls
+        ])
+
+        agent_counts = Counter(agent_name for agent_name, _, _ in calls)
+        updated_information = []
+        for (agent_name, _, tool_call_id), observation in zip(calls, observations):
+            observation = str(observation).strip()
+            # An agent called more than once in the batch gets one state key per tool call, so no response is overwritten
+            key = f"{agent_name}_reponse" if agent_counts[agent_name] == 1 else f"{agent_name}_{tool_call_id}_reponse"
+            # save to agent's persistent memory, i.e. in a state-variable dictionary
+            self.save_to_memory(key, observation)
+            updated_information.append(f"{key}: {observation}")
+        updated_information = "\n\n".join(updated_information)
+        self.logger.log(
+            f"Observations: {updated_information}",
+            level=LogLevel.INFO,
+        )
+        memory_step.observations = updated_information
+        return None
+        
     async def _process_tool_call(self, memory_step: ActionStep, agent_name:str, agent_arguments: Any) -> Union[None, Any]:
         """Process a tool call with the given name and arguments"""
         # Excecute the tool call
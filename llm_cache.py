@@ -0,0 +1,57 @@
+import asyncio
+import functools
+import hashlib
+from collections.abc import AsyncGenerator, Callable
+
+from acp_sdk.models import Message, MessagePart
+from acp_sdk.server import RunYield, RunYieldResume
+from diskcache import Cache
+
+# Exact-match response cache shared by every cached ACP agent
+llm_cache = Cache("./.llm_cache")
+
+
+def _cache_enabled(input: list[Message]) -> bool:
+    """
+    A top-level `cache: false` field on the first message part opts a request out of caching,
+    e.g. MessagePart(content=..., cache=False). MessagePart allows extra fields, whereas its
+    typed `metadata` models would drop or reject an unknown `cache` key.
+    """
+    return getattr(input[0].parts[0], "cache", True) is not False
+
+
+def cached(*models: str) -> Callable:
+    """
+    Memoize an ACP agent's messages by the SHA-256 of its models, agent name and input content.
+    On a hit the stored messages are replayed without calling the LLM.
+
+    Args:
+        models: Every model that can produce the agent's output, so switching any of them invalidates old entries
+    """
+    def decorator(agent_fn: Callable) -> Callable:
+        @functools.wraps(agent_fn)
+        async def wrapper(input: list[Message]) -> AsyncGenerator[RunYield, RunYieldResume]:
+            if not _cache_enabled(input):
+                async for item in agent_fn(input):
+                    yield item
+                return
+
+            # NUL-delimited so field boundaries cannot shift between models, agent name and content
+            key = hashlib.sha256(
+                "\0".join((*models, agent_fn.__name__, input[0].parts[0].content)).encode()
+            ).hexdigest()
+            # diskcache is backed by sqlite, so reads and writes stay off the event loop
+            hit = await asyncio.to_thread(llm_cache.get, key)
+            if hit is not None:
+                for parts in hit:
+                    yield Message(parts=[MessagePart(content=content) for content in parts])
+                return
+
+            messages = []
+            async for item in agent_fn(input):
+                if isinstance(item, Message):
+                    messages.append([part.content for part in item.parts])
+                yield item
+            await asyncio.to_thread(llm_cache.set, key, messages)
+        return wrapper
+    return decorator
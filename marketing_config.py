@@ -0,0 +1,58 @@
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Final, Mapping
+
+import httpx
+from acp_sdk.client import Client
+
+
+class MarketingWorkflowConfig:
+    """Configuration for the marketing workflow"""
+    PLANNER_SERVER_URL = "http://localhost:8000"
+    WRITER_SERVER_URL = "http://localhost:8001"
+    
+    # Each workflow holds a handful of connections to one planner and one writer; a long keepalive
+    # keeps them open between runs instead of re-handshaking after httpx's default 5s idle expiry
+    POOL_LIMITS = httpx.Limits(max_keepalive_connections=4, max_connections=8, keepalive_expiry=300)
+    
+    DEFAULT_REQUEST = "Create a comprehensive marketing strategy to increase brand awareness and drive customer acquisition"
+    
+    # Default marketing context, read-only so merging with {**DEFAULT_CONTEXT, **overrides} never needs a defensive copy
+    DEFAULT_CONTEXT: Final[Mapping[str, object]] = MappingProxyType({
+        "company_type": "AI startup",
+        "industry": "Marketing Technology",
+        "target_audience": "Marketing professionals, business owners, and growth teams",
+        "value_proposition": "AI-powered marketing optimization and content creation",
+        "key_benefits": (
+            "Automated content generation",
+            "SEO optimization",
+            "Audience targeting",
+            "Performance analytics"
+        )
+    })
+
+
+@lru_cache(maxsize=128)
+def join_benefits(key_benefits: tuple) -> str:
+    """Join key benefits once per unique benefit list"""
+    return ', '.join(key_benefits)
+
+
+def create_client(base_url: str) -> Client:
+    """Create an ACP client whose HTTP transport uses the workflow's connection pool limits"""
+    return Client(
+        base_url=base_url,
+        transport=httpx.AsyncHTTPTransport(limits=MarketingWorkflowConfig.POOL_LIMITS)
+    )
+
+
+# Long-lived ACP clients so connection pools survive across workflow runs
+PLANNER_CLIENT = create_client(MarketingWorkflowConfig.PLANNER_SERVER_URL)
+WRITER_CLIENT = create_client(MarketingWorkflowConfig.WRITER_SERVER_URL)
+
+
+async def close_clients() -> None:
+    """Close the shared ACP clients. Call once on shutdown."""
+    # The clients are never entered, so close their HTTP pools directly instead of calling __aexit__
+    for client in (PLANNER_CLIENT, WRITER_CLIENT):
+        await client.client.aclose()
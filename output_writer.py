@@ -0,0 +1,33 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _write(path: str, data: bytes) -> None:
+    """Write one output file, overwriting it if it exists."""
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+class OutputWriter:
+    """
+    Writes workflow outputs from a single background thread.
+    Writes submitted by concurrent workflows queue up on that thread, so the event loop
+    never blocks on disk and simultaneous runs do not each claim an executor thread.
+    """
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="output-writer")
+
+    async def submit(self, path: str, data: bytes) -> None:
+        """
+        Queue a file write and wait until it has been written.
+
+        Args:
+            path: Destination file, overwritten if it exists
+            data: Encoded file contents
+        """
+        await asyncio.get_running_loop().run_in_executor(self._executor, _write, path, data)
+
+
+# Shared by every workflow in the process
+output_writer = OutputWriter()
@@ -0,0 +1,110 @@
+import asyncio
+import math
+import re
+import sqlite3
+import threading
+from array import array
+from typing import NamedTuple, Optional
+
+import google.generativeai as genai
+
+EMBEDDING_MODEL = "models/text-embedding-004"
+SIMILARITY_THRESHOLD = 0.90
+MAX_PLANS = 500
+
+# The planner prompt is mostly fixed template text; only the company context and the request vary
+_VARYING_PART = re.compile(r"COMPANY CONTEXT:.*?SPECIFIC REQUEST:[^\n]*", re.DOTALL)
+
+
+class CachedPlan(NamedTuple):
+    """A previously generated plan and the prompt it was generated for."""
+    prompt: str
+    plan: str
+    similarity: float
+
+
+def _varying_text(prompt: str) -> str:
+    """Strip the shared template text from a planner prompt, falling back to the whole prompt."""
+    match = _VARYING_PART.search(prompt)
+    return match.group(0) if match else prompt
+
+
+def _cosine_similarity(a: array, b: array) -> float:
+    """Cosine similarity between two embedding vectors."""
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class PlanCache:
+    """
+    Agentic plan cache: stores finished marketing plans keyed by the embedding of the prompt
+    that produced them, so near-identical requests can adapt a cached plan instead of
+    re-running the full research and strategy pipeline.
+    Only the newest MAX_PLANS plans are kept. The sqlite work runs in a worker thread so the
+    linear similarity scan never blocks the server's event loop.
+    """
+
+    def __init__(
+        self,
+        path: str = "plan_cache.sqlite",
+        api_key: Optional[str] = None,
+        threshold: float = SIMILARITY_THRESHOLD,
+        max_plans: int = MAX_PLANS
+    ):
+        self.threshold = threshold
+        self.max_plans = max_plans
+        if api_key:
+            genai.configure(api_key=api_key)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        # Concurrent requests reach the connection from different worker threads
+        self._lock = threading.Lock()
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS plans (embedding BLOB NOT NULL, prompt TEXT NOT NULL, plan TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    async def embed(self, prompt: str) -> array:
+        """
+        Embed the parts of a planner prompt that vary between requests with the Gemini embedding model.
+        Embedding the fixed template text too would make prompts for different companies look near-identical.
+        """
+        result = await genai.embed_content_async(model=EMBEDDING_MODEL, content=_varying_text(prompt))
+        return array("f", result["embedding"])
+
+    async def lookup(self, embedding: array) -> Optional[CachedPlan]:
+        """
+        Find the cached plan whose prompt is most similar to the given embedding.
+
+        Returns:
+            CachedPlan or None: Best match at or above the similarity threshold
+        """
+        return await asyncio.to_thread(self._lookup, embedding)
+
+    def _lookup(self, embedding: array) -> Optional[CachedPlan]:
+        with self._lock:
+            rows = self._conn.execute("SELECT embedding, prompt, plan FROM plans").fetchall()
+        best = None
+        for blob, prompt, plan in rows:
+            cached_embedding = array("f")
+            cached_embedding.frombytes(blob)
+            similarity = _cosine_similarity(embedding, cached_embedding)
+            if similarity >= self.threshold and (best is None or similarity > best.similarity):
+                best = CachedPlan(prompt=prompt, plan=plan, similarity=similarity)
+        return best
+
+    async def store(self, embedding: array, prompt: str, plan: str) -> None:
+        """Save a freshly generated plan for future lookups, evicting the oldest beyond max_plans."""
+        await asyncio.to_thread(self._store, embedding, prompt, plan)
+
+    def _store(self, embedding: array, prompt: str, plan: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO plans (embedding, prompt, plan) VALUES (?, ?, ?)",
+                (embedding.tobytes(), prompt, plan)
+            )
+            self._conn.execute(
+                "DELETE FROM plans WHERE rowid NOT IN (SELECT rowid FROM plans ORDER BY rowid DESC LIMIT ?)",
+                (self.max_plans,)
+            )
+            self._conn.commit()
@@ -2,13 +2,13 @@ from collections.abc import AsyncGenerator
 from acp_sdk.models import Message, MessagePart
 from acp_sdk.server import RunYield, RunYieldResume, Server
 from crewai import Crew, Task, Agent, LLM
-from crewai_tools import SerperDevTool, WebsiteSearchTool
-import nest_asyncio
 from dotenv import load_dotenv
 import os
 import logging
-
-nest_asyncio.apply()
+from plan_cache import PlanCache
+from llm_cache import cached
+from cached_tools import BatchSerperDevTool, CachedSerperDevTool, CachedWebsiteSearchTool
+from crew_setup import CREW_VERBOSE, request_agent
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -26,79 +26,90 @@ llm = LLM(
     model=MODEL,
     api_key=gemini_api_key,
     temperature=0.7,  # Balanced for strategic planning
-    max_tokens=4096   # Increased for comprehensive marketing plans
+    max_tokens=8192   # Research and the full strategy share one task, so this covers both halves
+)
+
+# Near-identical requests adapt a cached plan instead of re-running research
+plan_cache = PlanCache(api_key=gemini_api_key)
+
+search_tool = CachedSerperDevTool()
+website_search_tool = CachedWebsiteSearchTool()
+# Lets the strategist fan out several searches in one step instead of one round trip each
+batch_search_tool = BatchSerperDevTool(search_tool=search_tool)
+
+# A single strategist researches and plans in one task, saving a second LLM pass over the shared context
+_STRATEGY_CONSULTANT_PROFILE = dict(
+    role="Senior Marketing Strategy Consultant",
+    goal="Research the market and develop comprehensive marketing strategies and tactical plans based on those insights",
+    backstory=(
+        "You are a senior marketing strategy consultant with 12+ years of experience in digital marketing. "
+        "You have helped Fortune 500 companies and startups develop successful marketing strategies. "
+        "You specialize in multi-channel marketing, customer journey optimization, and ROI-driven campaigns. "
+        "You understand how to translate market insights into actionable marketing plans that drive results. "
+        "You excel at gathering and analyzing data from multiple sources, including competitive analysis "
+        "and trend identification, to ground every plan in actionable insights."
+    ),
+    verbose=CREW_VERBOSE,
+    allow_delegation=False,
+    llm=llm,
+    max_retry_limit=3
 )
+strategy_consultant = Agent(**_STRATEGY_CONSULTANT_PROFILE, tools=[search_tool, batch_search_tool, website_search_tool])
+# Same consultant without web search, used to adapt cached plans
+plan_adapter = Agent(**_STRATEGY_CONSULTANT_PROFILE, tools=[])
 
 @server.agent()
+@cached(MODEL)
 async def marketing_planner(input: list[Message]) -> AsyncGenerator[RunYield, RunYieldResume]:
     """
     Marketing planner agent that automatically performs research, analysis, and creates comprehensive marketing plans.
-    Uses CrewAI to orchestrate multiple specialized agents for a complete workflow.
+    Uses a single CrewAI strategist task and yields the whole plan, Research and Strategy sections included, as one message.
     """    
     logger.info("Starting marketing planning process...")
-    
-    # Create specialized agents for different aspects of marketing planning
-    market_researcher = Agent(
-        role="Market Research Analyst",
-        goal="Conduct comprehensive market research and competitive analysis to identify opportunities and trends",
-        backstory=(
-            "You are a senior market research analyst with 8+ years of experience in digital marketing research. "
-            "You specialize in competitive analysis, trend identification, and market opportunity assessment. "
-            "You have helped numerous companies understand their market position and identify growth opportunities. "
-            "You excel at gathering and analyzing data from multiple sources to provide actionable insights."
-        ),
-        verbose=True,
-        allow_delegation=False,
-        llm=llm,
-        tools=[SerperDevTool(), WebsiteSearchTool()],
-        max_retry_limit=3
-    )
-    
-    strategy_consultant = Agent(
-        role="Senior Marketing Strategy Consultant",
-        goal="Develop comprehensive marketing strategies and tactical plans based on research insights",
-        backstory=(
-            "You are a senior marketing strategy consultant with 12+ years of experience in digital marketing. "
-            "You have helped Fortune 500 companies and startups develop successful marketing strategies. "
-            "You specialize in multi-channel marketing, customer journey optimization, and ROI-driven campaigns. "
-            "You understand how to translate market insights into actionable marketing plans that drive results."
-        ),
-        verbose=True,
-        allow_delegation=False,
-        llm=llm,
-        tools=[SerperDevTool(), WebsiteSearchTool()],
-        max_retry_limit=3
-    )
-    
-    # Create tasks for the workflow
-    research_task = Task(
+    request = input[0].parts[0].content
+
+    try:
+        embedding = await plan_cache.embed(request)
+    except Exception as e:
+        logger.warning(f"Plan cache unavailable, running full planning: {e}")
+        embedding = None
+    hit = await plan_cache.lookup(embedding) if embedding is not None else None
+
+    if hit:
+        logger.info(f"Plan cache hit (similarity {hit.similarity:.2f}), adapting cached plan...")
+        adapter = request_agent(plan_adapter)
+        adapt_task = Task(
+            description=(
+                f"Adapt this plan to new context: {request}\n\n"
+                f"The plan below was written for this earlier request:\n{hit.prompt}\n\n"
+                f"{hit.plan}\n\n"
+                "Keep the '## Research' and '## Strategy' structure and everything that still applies; "
+                "revise only what the new context changes."
+            ),
+            expected_output="The complete adapted marketing plan document with the same sections and professional formatting",
+            agent=adapter
+        )
+        crew = Crew(agents=[adapter], tasks=[adapt_task], verbose=CREW_VERBOSE)
+        task_output = await crew.kickoff_async()
+        yield Message(parts=[MessagePart(content=str(task_output))])
+        return
+
+    consultant = request_agent(strategy_consultant)
+
+    # Create one fused task covering both research and strategy
+    planning_task = Task(
         description=(
-            f"Conduct comprehensive market research for: {input[0].parts[0].content}\n\n"
+            f"Conduct comprehensive market research and then develop a comprehensive marketing plan for: {request}\n\n"
+            "Structure your answer in exactly two top-level sections, '## Research' followed by '## Strategy'.\n\n"
             "Research Requirements:\n"
             "1. Market size and growth trends\n"
             "2. Competitive landscape analysis\n"
             "3. Target audience demographics and behavior\n"
             "4. Industry best practices and emerging trends\n"
             "5. Potential challenges and opportunities\n"
-            "6. Relevant case studies and success stories\n\n"
-            "Provide detailed findings with data sources and actionable insights."
-        ),
-        expected_output=(
-            "A comprehensive market research report including:\n"
-            "- Market overview and size\n"
-            "- Competitive analysis\n"
-            "- Target audience insights\n"
-            "- Industry trends and opportunities\n"
-            "- Relevant case studies\n"
-            "- Data sources and methodology"
-        ),
-        agent=market_researcher
-    )
-    
-    strategy_task = Task(
-        description=(
-            "Based on the market research findings, develop a comprehensive marketing plan.\n\n"
-            "Strategy Requirements:\n"
+            "6. Relevant case studies and success stories\n"
+            "Provide detailed findings with data sources and actionable insights.\n\n"
+            "Strategy Requirements (based on the research findings):\n"
             "1. Executive Summary\n"
             "2. Market Analysis Summary\n"
             "3. Target Audience Analysis\n"
@@ -118,7 +129,15 @@ async def marketing_planner(input: list[Message]) -> AsyncGenerator[RunYield, Ru
             "Format as a professional marketing plan document."
         ),
         expected_output=(
-            "A complete marketing plan document with:\n"
+            "A markdown document with exactly two top-level sections:\n"
+            "## Research - a comprehensive market research report including:\n"
+            "- Market overview and size\n"
+            "- Competitive analysis\n"
+            "- Target audience insights\n"
+            "- Industry trends and opportunities\n"
+            "- Relevant case studies\n"
+            "- Data sources and methodology\n"
+            "## Strategy - a complete marketing plan document with:\n"
             "- Executive summary\n"
             "- Detailed strategy sections\n"
             "- Implementation timeline\n"
@@ -127,19 +146,26 @@ async def marketing_planner(input: list[Message]) -> AsyncGenerator[RunYield, Ru
             "- Risk assessment\n"
             "- Professional formatting and structure"
         ),
-        agent=strategy_consultant
+        agent=consultant
     )
     
     crew = Crew(
-        agents=[market_researcher, strategy_consultant],
-        tasks=[research_task, strategy_task],
-        verbose=True
+        agents=[consultant],
+        tasks=[planning_task],
+        verbose=CREW_VERBOSE
     )
     
-    task_output = await crew.kickoff_async()
+    plan = str(await crew.kickoff_async())
+    if embedding is not None:
+        await plan_cache.store(embedding, request, plan)
 
-    yield Message(parts=[MessagePart(content=str(task_output))])
+    yield Message(parts=[MessagePart(content=plan)])
     
 
 if __name__ == "__main__":
+    # Load the website search embedder and vector store before the first request pays for it
+    try:
+        website_search_tool.run(search_query="warmup")
+    except Exception as e:
+        logger.warning(f"Website search warm-up failed: {e}")
     server.run(port=8000)
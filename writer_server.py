@@ -2,13 +2,17 @@ from collections.abc import AsyncGenerator
 from acp_sdk.models import Message, MessagePart
 from acp_sdk.server import RunYield, RunYieldResume, Server
 from crewai import Crew, Task, Agent, LLM
-from crewai_tools import SerperDevTool, WebsiteSearchTool
-import nest_asyncio
 from dotenv import load_dotenv
 import os
+import re
+import logging
+from llm_cache import cached
+from cached_tools import CachedSerperDevTool, CachedWebsiteSearchTool
+from crew_setup import CREW_VERBOSE, request_agent
 
-nest_asyncio.apply()
-
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 
 # Initialize a server
 server = Server()
@@ -25,90 +29,78 @@ llm = LLM(
     max_tokens=8192   # Increased for longer blog posts
 )
 
-# Define agent on the server
-@server.agent()
-async def blog_writer(input: list[Message]) -> AsyncGenerator[RunYield, RunYieldResume]:
-    """
-    Expert content writer agent that creates SEO-optimized, engaging blog posts.
-    Specializes in tech and marketing content with strong conversion optimization.
-    """
-     
-    content_writer = Agent(
-        role="Senior Content Marketing Specialist",
-        goal="Create high-converting, SEO-optimized blog posts that drive engagement and conversions",
-        backstory=(
-            "You are a senior content marketing specialist with 10+ years of experience in digital marketing "
-            "and content creation. You have a proven track record of creating viral blog posts that generate "
-            "millions of views and thousands of leads. You specialize in tech and marketing content, with deep "
-            "expertise in SEO, conversion optimization, and audience engagement. You understand how to write "
-            "content that ranks well in search engines while maintaining high readability and engagement rates. "
-            "You have helped numerous startups and tech companies build their content marketing strategies "
-            "and achieve significant growth through content-driven lead generation."
-        ),
-        verbose=True,
-        allow_delegation=False,
-        llm=llm,
-        tools=[SerperDevTool(), WebsiteSearchTool()],
-        max_retry_limit=3
-    )
+# Cleanup is deterministic editing, so it runs on a smaller, faster model with a tighter output budget
+CLEANUP_MODEL = "gemini/gemini-2.0-flash-lite"
+llm_cleanup = LLM(
+    model=CLEANUP_MODEL,
+    api_key=gemini_api_key,
+    temperature=0.0,  # Deterministic cleanup
+    max_tokens=2048   # Enough for the cleaned 1000-1500 word post
+)
 
-    # Create a task for content creation
-    task = Task(
-        description=input[0].parts[0].content,
-        expected_output=(
-            "Write a complete, SEO-optimized blog post (1000-1500 words) with:\n"
-            "- Engaging headline and meta description\n"
-            "- Compelling introduction\n"
-            "- Well-structured content with clear headings\n"
-            "- Actionable insights and examples\n"
-            "- Strong conclusion with call-to-action\n"
-            "- Natural keyword integration\n"
-            "- SEO considerations and internal linking suggestions\n"
-            "- Meta tags and schema markup recommendations\n\n"
-            "Include all the technical SEO elements and meta-information that would be useful for publishing."
-        ),
-        agent=content_writer
-    )
-    
-    crew = Crew(
-        agents=[content_writer], 
-        tasks=[task], 
-        verbose=True
-    )
-    
-    task_output = await crew.kickoff_async()
-    yield Message(parts=[MessagePart(content=str(task_output))])
+# Section headers the writer must not emit; seeing one triggers the supervisor cleanup fallback.
+# A title counts as a heading ("## SEO Considerations"), a bold label ("**Meta Tags:**") or a plain
+# label ("Meta Description: ..."). Prose such as "Internal linking between your product pages helps..."
+# or headings such as "# Meta descriptions matter for SEO" do not match.
+_FORBIDDEN_TITLES = r"(?:SEO Considerations|Meta Tags|Meta Description|Internal Linking|Schema Markup)\b"
+FORBIDDEN_SECTION = re.compile(
+    rf"^[ \t]*(?:#+[ \t]*{_FORBIDDEN_TITLES}"
+    rf"|\*\*{_FORBIDDEN_TITLES}[^*\n]*\*\*"
+    rf"|{_FORBIDDEN_TITLES}(?:[ \t]+\w+){{0,4}}[ \t]*:)",
+    re.IGNORECASE | re.MULTILINE
+)
 
-@server.agent()
-async def supervisor_agent(input: list[Message]) -> AsyncGenerator[RunYield, RunYieldResume]:
-    """
-    Supervisor agent that takes blog content and converts it to ready-to-use format.
-    Removes meta-instructions, SEO considerations, and formatting guidelines.
-    """
-        
-    supervisor = Agent(
-        role="Content Editor and Publisher",
-        goal="Transform raw blog content into clean, ready-to-publish format",
-        backstory=(
-            "You are an experienced content editor and publisher with expertise in preparing content "
-            "for publication. You understand the difference between raw content with instructions and "
-            "clean, publishable content. You excel at removing meta-information, formatting guidelines, "
-            "and technical instructions while preserving the core message and value of the content. "
-            "You ensure content is properly formatted for immediate use in content management systems, "
-            "blogs, and other publishing platforms."
-        ),
-        verbose=True,
-        allow_delegation=False,
-        llm=llm,
-        tools=[],
-        max_retry_limit=3
-    )
+search_tool = CachedSerperDevTool()
+website_search_tool = CachedWebsiteSearchTool()
+
+content_writer = Agent(
+    role="Senior Content Marketing Specialist",
+    goal="Create high-converting, SEO-optimized blog posts that drive engagement and conversions",
+    backstory=(
+        "You are a senior content marketing specialist with 10+ years of experience in digital marketing "
+        "and content creation. You have a proven track record of creating viral blog posts that generate "
+        "millions of views and thousands of leads. You specialize in tech and marketing content, with deep "
+        "expertise in SEO, conversion optimization, and audience engagement. You understand how to write "
+        "content that ranks well in search engines while maintaining high readability and engagement rates. "
+        "You have helped numerous startups and tech companies build their content marketing strategies "
+        "and achieve significant growth through content-driven lead generation. "
+        "You output ONLY clean, ready-to-publish markdown and never emit SEO Considerations, "
+        "Meta Tags or Internal Linking sections."
+    ),
+    verbose=CREW_VERBOSE,
+    allow_delegation=False,
+    llm=llm,
+    tools=[search_tool, website_search_tool],
+    max_retry_limit=3
+)
+
+supervisor = Agent(
+    role="Content Editor and Publisher",
+    goal="Transform raw blog content into clean, ready-to-publish format",
+    backstory=(
+        "You are an experienced content editor and publisher with expertise in preparing content "
+        "for publication. You understand the difference between raw content with instructions and "
+        "clean, publishable content. You excel at removing meta-information, formatting guidelines, "
+        "and technical instructions while preserving the core message and value of the content. "
+        "You ensure content is properly formatted for immediate use in content management systems, "
+        "blogs, and other publishing platforms."
+    ),
+    verbose=CREW_VERBOSE,
+    allow_delegation=False,
+    llm=llm_cleanup,
+    tools=[],
+    max_retry_limit=3
+)
+
+async def clean_up(content: str) -> str:
+    """Run the supervisor's cleanup pass over raw blog content."""
+    editor = request_agent(supervisor)
 
     # Create a task for content cleanup
     task = Task(
         description=(
             f"Take the following blog content and convert it to a clean, ready-to-publish format:\n\n"
-            f"{input[0].parts[0].content}\n\n"
+            f"{content}\n\n"
             f"Your task is to:\n"
             f"1. Remove all meta-instructions and formatting guidelines\n"
             f"2. Remove 'SEO Considerations' sections\n"
@@ -133,17 +125,84 @@ async def supervisor_agent(input: list[Message]) -> AsyncGenerator[RunYield, Run
             "- No formatting instructions\n"
             "- Content that can be directly copied and pasted into a CMS"
         ),
-        agent=supervisor
+        agent=editor
+    )
+    
+    crew = Crew(
+        agents=[editor], 
+        tasks=[task], 
+        verbose=CREW_VERBOSE
+    )
+    
+    task_output = await crew.kickoff_async()
+    return str(task_output)
+
+# Define agent on the server
+@server.agent()
+@cached(MODEL, CLEANUP_MODEL)  # Output may come from the supervisor fallback on CLEANUP_MODEL
+async def blog_writer(input: list[Message]) -> AsyncGenerator[RunYield, RunYieldResume]:
+    """
+    Expert content writer agent that creates SEO-optimized, engaging blog posts.
+    Specializes in tech and marketing content with strong conversion optimization.
+    Output is clean and ready to publish; the supervisor pass only runs if a forbidden section slips through.
+    """
+    writer = request_agent(content_writer)
+
+    # Create a single task that writes and cleans the post in one pass
+    task = Task(
+        description=(
+            f"{input[0].parts[0].content}\n\n"
+            "Produce clean, ready-to-publish markdown directly:\n"
+            "1. Start with the main headline\n"
+            "2. Do not include meta-instructions or formatting guidelines\n"
+            "3. Do not include 'SEO Considerations', 'Internal Linking Suggestions' or "
+            "'Meta Tags and Schema Markup Suggestions' sections\n"
+            "4. Do not include keyword lists or technical SEO instructions\n"
+            "5. End with a strong conclusion and call-to-action"
+        ),
+        expected_output=(
+            "A complete, SEO-optimized, ready-to-publish blog post (1000-1500 words) in markdown format with:\n"
+            "- Engaging headline\n"
+            "- Compelling introduction\n"
+            "- Well-structured content with clear headings\n"
+            "- Actionable insights and examples\n"
+            "- Strong conclusion with call-to-action\n"
+            "- Natural keyword integration\n"
+            "- No meta-information, SEO notes or keyword lists\n"
+            "- Content that can be directly copied and pasted into a CMS\n\n"
+            "Output ONLY clean markdown; never emit SEO Considerations, Meta Tags, or Internal Linking sections."
+        ),
+        agent=writer
     )
     
     crew = Crew(
-        agents=[supervisor], 
+        agents=[writer], 
         tasks=[task], 
-        verbose=True
+        verbose=CREW_VERBOSE
     )
     
     task_output = await crew.kickoff_async()
-    yield Message(parts=[MessagePart(content=str(task_output))])
+    blog_post = str(task_output)
+    if FORBIDDEN_SECTION.search(blog_post):
+        logger.info("Writer emitted meta/SEO sections, falling back to supervisor cleanup...")
+        blog_post = await clean_up(blog_post)
+
+    yield Message(parts=[MessagePart(content=blog_post)])
+
+@server.agent()
+@cached(CLEANUP_MODEL)
+async def supervisor_agent(input: list[Message]) -> AsyncGenerator[RunYield, RunYieldResume]:
+    """
+    Supervisor agent that takes blog content and converts it to ready-to-use format.
+    Removes meta-instructions, SEO considerations, and formatting guidelines.
+    """
+    clean_post = await clean_up(input[0].parts[0].content)
+    yield Message(parts=[MessagePart(content=clean_post)])
 
 if __name__ == "__main__":
+    # Load the website search embedder and vector store before the first request pays for it
+    try:
+        website_search_tool.run(search_query="warmup")
+    except Exception as e:
+        logger.warning(f"Website search warm-up failed: {e}")
     server.run(port=8001) 
\ No newline at end of file